@@ -19,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from context import BuildContext
 from utils import log_info, log_error, log_success, log_warning, join_paths
+from modules.dev_cli.patch_index import PatchIndex
 
 
 @dataclass
@@ -149,6 +150,11 @@ def cli(ctx, chromium_src, verbose, quiet):
     ctx.obj["chromium_src"] = chromium_src
     ctx.obj["verbose"] = verbose
     ctx.obj["quiet"] = quiet
+    # cli is not a chained group, so a run executes a single subcommand and
+    # this index starts empty every time. It is only reused by code that
+    # calls apply_all_patches() several times in one process and passes
+    # the same index; such code must invalidate() it after writing patches.
+    ctx.obj["patch_index"] = PatchIndex()
 
 
 # Import and register subcommand groups
@@ -5,38 +5,93 @@ Simple and straightforward patch application with minimal error handling.
 """
 
 import click
+import heapq
+import os
 import yaml
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Dict, Iterable, List, Tuple, Optional
 from context import BuildContext
 from modules.dev_cli.utils import run_git_command, GitError
+from modules.dev_cli.patch_index import (
+    DEFAULT_PRUNE_DIRS,
+    PatchIndex,
+    scandir_patches,
+)
 from utils import log_info, log_error, log_success, log_warning
 
+# Number of patches handed to a single git apply invocation
+PATCH_BATCH_SIZE = 64
+
+# Concurrent git apply processes; threads suffice as they only wait on git
+MAX_APPLY_WORKERS = min(32, (os.cpu_count() or 1) * 2)
+
 
 # Core Functions - Can be called programmatically or from CLI
-def find_patch_files(patches_dir: Path) -> List[Path]:
+def find_patch_entries(
+    patches_dir: Path,
+    subpath: Optional[str] = None,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+    index: Optional[PatchIndex] = None,
+) -> List[Tuple[Path, int]]:
+    """Find all valid patch files in a directory along with their sizes.
+
+    Args:
+        patches_dir: Directory to search for patches
+        subpath: Only search this subdirectory of patches_dir (optional)
+        prune_dirs: Directory names to skip while searching
+        index: Shared patch index to reuse a previous full walk (optional)
+
+    Returns:
+        List of (patch_path, size_in_bytes) tuples, sorted by path
+
+    Raises:
+        ValueError: If subpath points outside patches_dir or is not a
+            directory
+    """
+    if index is not None and not subpath:
+        entries = index.entries(patches_dir, prune_dirs)
+    else:
+        start_dir = patches_dir
+        if subpath:
+            # Rebuild the subpath from its resolved form so '..' and
+            # absolute paths cannot escape the patches directory
+            root = patches_dir.resolve()
+            target = (patches_dir / subpath).resolve()
+            if target != root and root not in target.parents:
+                raise ValueError(f"Subpath is outside {patches_dir}: {subpath}")
+            start_dir = patches_dir / target.relative_to(root)
+        if not start_dir.exists():
+            return []
+        if not start_dir.is_dir():
+            raise ValueError(f"Subpath is not a directory: {subpath}")
+        entries = sorted(scandir_patches(str(start_dir), frozenset(prune_dirs)))
+
+    return [(Path(p), size) for p, size in entries]
+
+
+def find_patch_files(
+    patches_dir: Path,
+    subpath: Optional[str] = None,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+    index: Optional[PatchIndex] = None,
+) -> List[Path]:
     """Find all valid patch files in a directory.
 
     Args:
         patches_dir: Directory to search for patches
+        subpath: Only search this subdirectory of patches_dir (optional)
+        prune_dirs: Directory names to skip while searching
+        index: Shared patch index to reuse a previous full walk (optional)
 
     Returns:
         List of patch file paths, sorted
+
+    Raises:
+        ValueError: If subpath points outside patches_dir or is not a
+            directory
     """
-    if not patches_dir.exists():
-        return []
-
-    return sorted(
-        [
-            p
-            for p in patches_dir.rglob("*")
-            if p.is_file()
-            and not p.name.endswith(".deleted")
-            and not p.name.endswith(".binary")
-            and not p.name.endswith(".rename")
-            and not p.name.startswith(".")
-        ]
-    )
+    return [p for p, _ in find_patch_entries(patches_dir, subpath, prune_dirs, index)]
 
 
 def apply_single_patch(
@@ -108,6 +163,47 @@ def apply_single_patch(
             return False, result.stderr
 
 
+def apply_patch_batch(
+    patch_paths: List[Path], chromium_src: Path, dry_run: bool = False
+) -> bool:
+    """Apply several patch files with a single git apply invocation.
+
+    The patches are read here and piped to git apply on stdin as one
+    stream. When run on the apply thread pool, the reads for one batch
+    overlap with git processes already running for other batches.
+
+    git apply is all-or-nothing across its inputs, so when this returns
+    False nothing was changed and the patches can be retried one by one.
+
+    Args:
+        patch_paths: Patch files to apply together
+        chromium_src: Chromium source directory
+        dry_run: If True, only check if the patches would apply
+
+    Returns:
+        True if every patch in the batch applied cleanly
+    """
+    if dry_run:
+        cmd = ["git", "apply", "--check", "-p1"]
+    else:
+        cmd = ["git", "apply", "--ignore-whitespace", "--whitespace=nowarn", "-p1"]
+
+    chunks = []
+    for patch_path in patch_paths:
+        try:
+            data = patch_path.read_bytes()
+        except OSError:
+            # Let the per-patch retry report the unreadable file
+            return False
+        chunks.append(data)
+        # Keep the next patch's header on its own line
+        if data and not data.endswith(b"\n"):
+            chunks.append(b"\n")
+
+    result = run_git_command(cmd, cwd=chromium_src, input_data=b"".join(chunks))
+    return result.returncode == 0
+
+
 def create_patch_commit(
     patch_identifier: str, chromium_src: Path, feature_name: Optional[str] = None
 ) -> bool:
@@ -143,6 +239,127 @@ def create_patch_commit(
         return False
 
 
+def schedule_patch_batches(
+    patches: List[Tuple[Path, str]],
+    batch_size: int,
+    patch_sizes: Dict[Path, int],
+) -> List[List[Tuple[Path, str]]]:
+    """Split patches into batches of roughly equal total size.
+
+    Uses the longest-processing-time-first heuristic: patches are taken
+    largest first and each goes to the batch with the least bytes so far
+    that still has room, so no batch holds more than batch_size patches.
+    The batches are returned largest first so the biggest ones start
+    early instead of being the last thing the pool waits on.
+
+    Args:
+        patches: List of (patch_path, display_name) tuples
+        batch_size: Maximum number of patches in one batch
+        patch_sizes: Patch size in bytes keyed by patch path
+
+    Returns:
+        List of batches, each a list of (patch_path, display_name) tuples
+    """
+    batch_count = -(-len(patches) // batch_size)
+    batches: List[List[Tuple[Path, str]]] = [[] for _ in range(batch_count)]
+    totals = [0] * batch_count
+    heap = [(0, i) for i in range(batch_count)]
+
+    for patch in sorted(patches, key=lambda p: patch_sizes.get(p[0], 0), reverse=True):
+        _, i = heapq.heappop(heap)
+        batches[i].append(patch)
+        totals[i] += patch_sizes.get(patch[0], 0)
+        # Full batches leave the heap so they are never picked again
+        if len(batches[i]) < batch_size:
+            heapq.heappush(heap, (totals[i], i))
+
+    order = sorted(range(batch_count), key=lambda i: totals[i], reverse=True)
+    return [batches[i] for i in order]
+
+
+def process_patch_batches(
+    patch_list: List[Tuple[Path, str]],
+    chromium_src: Path,
+    patches_dir: Path,
+    dry_run: bool = False,
+    patch_sizes: Optional[Dict[Path, int]] = None,
+) -> Tuple[int, List[str]]:
+    """Process a list of patches in parallel batches.
+
+    Patches are split into up to PATCH_BATCH_SIZE-sized batches, spread
+    so every worker gets one, and each batch is applied with one git apply
+    call on a thread pool. Each per-file patch touches a different file
+    and plain git apply only writes the working tree, so batches do not
+    interfere. Patches from failed batches are then applied one by one
+    (with the 3-way fallback, which uses the index) to find and report
+    the ones that break.
+
+    When patch sizes are known, batches are balanced by size and the
+    largest are submitted first (see schedule_patch_batches).
+
+    Args:
+        patch_list: List of (patch_path, display_name) tuples
+        chromium_src: Chromium source directory
+        patches_dir: Base directory for relative path display
+        dry_run: Only check if patches would apply
+        patch_sizes: Patch size in bytes keyed by patch path (optional)
+
+    Returns:
+        Tuple of (applied_count, failed_list)
+    """
+    applied = 0
+    failed = []
+
+    existing = []
+    for patch_path, display_name in patch_list:
+        if patch_path.exists():
+            existing.append((patch_path, display_name))
+        else:
+            log_warning(f"  Patch not found: {display_name}")
+            failed.append(display_name)
+
+    batch_size = max(1, min(PATCH_BATCH_SIZE, -(-len(existing) // MAX_APPLY_WORKERS)))
+    if patch_sizes:
+        batches = schedule_patch_batches(existing, batch_size, patch_sizes)
+    else:
+        batches = [
+            existing[start : start + batch_size]
+            for start in range(0, len(existing), batch_size)
+        ]
+    retry = []
+
+    with ThreadPoolExecutor(max_workers=MAX_APPLY_WORKERS) as pool:
+        futures = {
+            pool.submit(
+                apply_patch_batch, [p for p, _ in batch], chromium_src, dry_run
+            ): batch
+            for batch in batches
+        }
+
+        for future in as_completed(futures):
+            batch = futures[future]
+            if not future.result():
+                retry.extend(batch)
+                continue
+
+            for _, display_name in batch:
+                if dry_run:
+                    log_success(f"  ✓ Would apply: {display_name}")
+                else:
+                    log_success(f"  ✓ Applied: {display_name}")
+            applied += len(batch)
+
+    # Failed batches fall back to one patch at a time, serially
+    for patch_path, display_name in sorted(retry):
+        success, _ = apply_single_patch(patch_path, chromium_src, dry_run, patches_dir)
+        if success:
+            applied += 1
+        else:
+            failed.append(display_name)
+
+    return applied, failed
+
+
 def process_patch_list(
     patch_list: List[Tuple[Path, str]],
     chromium_src: Path,
@@ -151,6 +368,7 @@ def process_patch_list(
     dry_run: bool = False,
     interactive: bool = False,
     feature_name: Optional[str] = None,
+    patch_sizes: Optional[Dict[Path, int]] = None,
 ) -> Tuple[int, List[str]]:
     """Process a list of patches.
 
@@ -162,10 +380,19 @@ def process_patch_list(
         dry_run: Only check if patches would apply
         interactive: Ask for confirmation before each patch
         feature_name: Optional feature name for commit messages
+        patch_sizes: Patch size in bytes keyed by patch path, used to
+            schedule batched applies (optional)
 
     Returns:
         Tuple of (applied_count, failed_list)
     """
+    # Without prompts or per-patch commits, patches can go through git
+    # apply in batches instead of one process per patch
+    if not interactive and not commit_each:
+        return process_patch_batches(
+            patch_list, chromium_src, patches_dir, dry_run, patch_sizes
+        )
+
     applied = 0
     failed = []
     skipped = 0
@@ -250,6 +477,9 @@ def apply_all_patches(
     commit_each: bool = False,
     dry_run: bool = False,
     interactive: bool = False,
+    subpath: Optional[str] = None,
+    prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS,
+    index: Optional[PatchIndex] = None,
 ) -> Tuple[int, List[str]]:
     """Apply all patches from patches directory.
 
@@ -258,9 +488,16 @@ def apply_all_patches(
         commit_each: Create a commit after each patch
         dry_run: Only check if patches would apply
         interactive: Ask for confirmation before each patch
+        subpath: Only apply patches under this subdirectory (optional)
+        prune_dirs: Directory names to skip while searching for patches
+        index: Shared patch index from the CLI context (optional)
 
     Returns:
         Tuple of (applied_count, failed_list)
+
+    Raises:
+        ValueError: If subpath points outside the patches directory or is
+            not a directory
     """
     patches_dir = build_ctx.get_dev_patches_dir()
 
@@ -269,19 +506,22 @@ def apply_all_patches(
         return 0, []
 
     # Find all patch files
-    patch_files = find_patch_files(patches_dir)
+    patch_entries = find_patch_entries(patches_dir, subpath, prune_dirs, index)
 
-    if not patch_files:
+    if not patch_entries:
         log_warning("No patch files found")
         return 0, []
 
-    log_info(f"Found {len(patch_files)} patches")
+    log_info(f"Found {len(patch_entries)} patches")
 
     if dry_run:
         log_info("DRY RUN - No changes will be made")
 
-    # Create patch list with display names
-    patch_list = [(p, p.relative_to(patches_dir)) for p in patch_files]
+    # Create patch list with display names. Every path starts with
+    # patches_dir, so slicing the string avoids a relative_to() per patch.
+    prefix_len = len(str(patches_dir)) + 1
+    patch_list = [(p, str(p)[prefix_len:]) for p, _ in patch_entries]
+    patch_sizes = dict(patch_entries)
 
     # Process patches
     applied, failed = process_patch_list(
@@ -291,6 +531,7 @@ def apply_all_patches(
         commit_each,
         dry_run,
         interactive,
+        patch_sizes=patch_sizes,
     )
 
     # Summary
@@ -389,8 +630,14 @@ def apply_group():
 @apply_group.command(name="all")
 @click.option("--commit-each", is_flag=True, help="Create git commit after each patch")
 @click.option("--dry-run", is_flag=True, help="Test patches without applying")
+@click.option("--subpath", help="Only apply patches under this directory")
+@click.option(
+    "--prune",
+    multiple=True,
+    help="Directory name to skip when searching for patches (repeatable)",
+)
 @click.pass_context
-def apply_all(ctx, commit_each, dry_run):
+def apply_all(ctx, commit_each, dry_run, subpath, prune):
     """Apply all patches from chromium_src/
 
     \b
@@ -398,6 +645,7 @@ def apply_all(ctx, commit_each, dry_run):
       dev apply all
       dev apply all --commit-each
       dev apply all --dry-run
+      dev apply all --subpath chrome/browser/ui
     """
     chromium_src = ctx.parent.obj.get("chromium_src")
 
@@ -407,7 +655,17 @@ def apply_all(ctx, commit_each, dry_run):
     if not build_ctx:
         return
 
-    applied, failed = apply_all_patches(build_ctx, commit_each, dry_run)
+    try:
+        applied, failed = apply_all_patches(
+            build_ctx,
+            commit_each,
+            dry_run,
+            subpath=subpath,
+            prune_dirs=DEFAULT_PRUNE_DIRS.union(prune),
+            index=ctx.parent.obj.get("patch_index"),
+        )
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--subpath")
 
     # Exit with error code if any patches failed
     if failed:
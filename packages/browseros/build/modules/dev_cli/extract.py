@@ -8,7 +8,7 @@ repository, storing them as individual file diffs that can be re-applied.
 import click
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Set
 from context import BuildContext
 from modules.dev_cli.utils import (
     FilePatch,
@@ -18,15 +18,45 @@ from modules.dev_cli.utils import (
     validate_git_repository,
     validate_commit_exists,
     parse_diff_output,
+    parse_diff_file,
     write_patch_file,
     create_deletion_marker,
     create_binary_marker,
+    ensure_parent_dir,
     log_extraction_summary,
     get_commit_info,
     get_commit_changed_files,
+    split_path_list,
 )
 from utils import log_info, log_error, log_success, log_warning
 
+# Most characters of file paths passed to a single git diff call. Keeps
+# the command line well under the 32,767 character limit on Windows.
+DIFF_PATHSPEC_BUDGET = 16000
+
+
+def group_paths(paths: List[str], budget: int) -> List[List[str]]:
+    """Split paths into groups whose total length stays within budget.
+
+    A path longer than the budget on its own still gets a group.
+    """
+    groups: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+
+    for path in paths:
+        # Each argument also costs a separating space on the command line
+        cost = len(path) + 1
+        if current and used + cost > budget:
+            groups.append(current)
+            current, used = [], 0
+        current.append(path)
+        used += cost
+
+    if current:
+        groups.append(current)
+    return groups
+
 
 @click.group(name="extract")
 def extract_group():
@@ -189,6 +219,86 @@ def extract_range(
         ctx.exit(1)
 
 
+@extract_group.command(name="patch")
+@click.argument(
+    "patch_file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option("--verbose", "-v", is_flag=True, help="Show detailed output")
+@click.option("--force", "-f", is_flag=True, help="Overwrite existing patches")
+@click.option("--include-binary", is_flag=True, help="Include binary files")
+@click.pass_context
+def extract_patch(ctx, patch_file, verbose, force, include_binary):
+    """Extract per-file patches from a monolithic patch file
+
+    \b
+    Examples:
+      dev extract patch ../patches/browseros/browseros-api.patch
+      dev extract patch combined.patch --force
+    """
+    # Get chromium source from parent context
+    chromium_src = ctx.parent.obj.get("chromium_src")
+
+    # Create build context
+    from dev import create_build_context
+
+    build_ctx = create_build_context(chromium_src)
+
+    if not build_ctx:
+        return
+
+    log_info(f"Extracting patches from file: {patch_file}")
+
+    try:
+        extracted = extract_patch_file(
+            build_ctx, patch_file, verbose, force, include_binary
+        )
+
+        if extracted > 0:
+            log_success(f"Successfully extracted {extracted} patches from {patch_file}")
+        else:
+            log_warning(f"No patches extracted from {patch_file}")
+
+    except Exception as e:
+        log_error(f"Unexpected error: {e}")
+        if verbose:
+            import traceback
+
+            traceback.print_exc()
+        ctx.exit(1)
+
+
+def extract_patch_file(
+    ctx: BuildContext,
+    patch_file: Path,
+    verbose: bool = False,
+    force: bool = False,
+    include_binary: bool = False,
+) -> int:
+    """Split a monolithic patch file into per-file patches
+
+    Args:
+        ctx: Build context
+        patch_file: Patch file containing diffs for one or more files
+        verbose: Show detailed output
+        force: Overwrite existing patches
+        include_binary: Include binary files
+
+    Returns:
+        Number of patches successfully extracted
+    """
+    file_patches = parse_diff_file(patch_file)
+
+    if not file_patches:
+        log_warning(f"No file diffs found in {patch_file}")
+        return 0
+
+    # Check for existing patches
+    if not force and not check_overwrite(ctx, file_patches, verbose):
+        return 0
+
+    return write_patches(ctx, file_patches, verbose, include_binary)
+
+
 def extract_single_commit(
     ctx: BuildContext,
     commit_hash: str,
@@ -238,24 +348,71 @@ def extract_normal(
     include_binary: bool,
 ) -> int:
     """Extract patches normally (diff against parent)"""
+    file_patches = collect_patches_normal(ctx, commit_hash, include_binary)
+
+    if not file_patches:
+        log_warning("No changes found in commit")
+        return 0
 
-    # Get diff against parent
-    diff_cmd = ["git", "diff", f"{commit_hash}^..{commit_hash}"]
+    # Check for existing patches
+    if not force and not check_overwrite(ctx, file_patches, verbose):
+        return 0
+
+    # Write patches
+    return write_patches(ctx, file_patches, verbose, include_binary)
+
+
+def collect_patches_normal(
+    ctx: BuildContext, commit_hash: str, include_binary: bool
+) -> Dict[str, FilePatch]:
+    """Get per-file patches for a commit diffed against its parent"""
+    # Get diff against first parent. diff-tree is plumbing, so it skips the
+    # porcelain setup of git diff and ignores user diff config such as
+    # diff.noprefix or diff.external. --root also handles initial commits.
+    # Rename detection is off by default for plumbing, so -M asks for it
+    # as diff.renames does for git diff.
+    diff_cmd = [
+        "git",
+        "diff-tree",
+        "-p",
+        "-r",
+        "-M",
+        "--no-commit-id",
+        "--root",
+        "--diff-merges=first-parent",
+        commit_hash,
+    ]
     if include_binary:
         diff_cmd.append("--binary")
 
-    result = run_git_command(diff_cmd, cwd=ctx.chromium_src)
+    result = run_git_command(diff_cmd, cwd=ctx.chromium_src, capture_bytes=True)
 
     if result.returncode != 0:
         raise GitError(f"Failed to get diff for commit {commit_hash}: {result.stderr}")
 
     # Parse diff into file patches
-    file_patches = parse_diff_output(result.stdout)
+    return parse_diff_output(result.stdout)
+
+
+def extract_with_base(
+    ctx: BuildContext,
+    commit_hash: str,
+    base: str,
+    verbose: bool,
+    force: bool,
+    include_binary: bool,
+) -> int:
+    """Extract patches with custom base (full diff from base for files in commit)"""
+    file_patches = collect_patches_with_base(
+        ctx, commit_hash, base, verbose, include_binary
+    )
 
     if not file_patches:
-        log_warning("No changes found in commit")
+        log_warning("No patches to extract")
         return 0
 
+    log_info(f"Extracting {len(file_patches)} patches with base {base}")
+
     # Check for existing patches
     if not force and not check_overwrite(ctx, file_patches, verbose):
         return 0
@@ -264,100 +421,60 @@ def extract_normal(
     return write_patches(ctx, file_patches, verbose, include_binary)
 
 
-def extract_with_base(
+def collect_patches_with_base(
     ctx: BuildContext,
     commit_hash: str,
     base: str,
     verbose: bool,
-    force: bool,
     include_binary: bool,
-) -> int:
-    """Extract patches with custom base (full diff from base for files in commit)"""
-
+) -> Dict[str, FilePatch]:
+    """Get full diffs from base for each file changed in a commit"""
     # Step 1: Get list of files changed in the commit
     changed_files = get_commit_changed_files(commit_hash, ctx.chromium_src)
 
     if not changed_files:
         log_warning(f"No files changed in commit {commit_hash}")
-        return 0
+        return {}
 
     if verbose:
         log_info(f"Files changed in {commit_hash}: {len(changed_files)}")
 
-    # Step 2: For each file, get diff from base to commit
-    file_patches = {}
-
-    for file_path in changed_files:
-        if verbose:
-            log_info(f"  Getting diff for: {file_path}")
-
-        # Get diff for this specific file from base to commit
-        diff_cmd = ["git", "diff", f"{base}..{commit_hash}", "--", file_path]
+    # Step 2: Get the diff from base to commit, a bounded group of files
+    # per call. Renames are disabled so every file gets its own
+    # add/delete/modify patch, as when each file is diffed on its own,
+    # which also keeps the groups independent of each other. Literal
+    # pathspecs keep names with *, ? or [ from being read as globs.
+    file_patches: Dict[str, FilePatch] = {}
+    for paths in group_paths(changed_files, DIFF_PATHSPEC_BUDGET):
+        diff_cmd = [
+            "git",
+            "--literal-pathspecs",
+            "diff",
+            "--no-renames",
+            f"{base}..{commit_hash}",
+        ]
         if include_binary:
             diff_cmd.append("--binary")
+        diff_cmd.append("--")
+        diff_cmd.extend(paths)
 
-        result = run_git_command(diff_cmd, cwd=ctx.chromium_src)
+        result = run_git_command(
+            diff_cmd, cwd=ctx.chromium_src, timeout=120, capture_bytes=True
+        )
 
         if result.returncode != 0:
-            log_warning(f"Failed to get diff for {file_path}")
-            continue
-
-        if result.stdout.strip():
-            # Parse this single file's diff
-            patches = parse_diff_output(result.stdout)
-            # Should only have one file in the result
-            if patches:
-                file_patches.update(patches)
-        else:
-            # File might have been added/deleted
-            # Check if file exists in base and commit
-            base_exists = (
-                run_git_command(
-                    ["git", "cat-file", "-e", f"{base}:{file_path}"],
-                    cwd=ctx.chromium_src,
-                ).returncode
-                == 0
-            )
-
-            commit_exists = (
-                run_git_command(
-                    ["git", "cat-file", "-e", f"{commit_hash}:{file_path}"],
-                    cwd=ctx.chromium_src,
-                ).returncode
-                == 0
+            raise GitError(
+                f"Failed to get diff from {base} for {commit_hash}: {result.stderr}"
             )
 
-            if not base_exists and commit_exists:
-                # File was added - get full content
-                diff_cmd = ["git", "diff", f"{base}..{commit_hash}", "--", file_path]
-                if include_binary:
-                    diff_cmd.append("--binary")
-                result = run_git_command(diff_cmd, cwd=ctx.chromium_src)
-                if result.stdout.strip():
-                    patches = parse_diff_output(result.stdout)
-                    if patches:
-                        file_patches.update(patches)
-            elif base_exists and not commit_exists:
-                # File was deleted
-                file_patches[file_path] = FilePatch(
-                    file_path=file_path,
-                    operation=FileOperation.DELETE,
-                    patch_content=None,
-                    is_binary=False,
-                )
-
-    if not file_patches:
-        log_warning("No patches to extract")
-        return 0
-
-    log_info(f"Extracting {len(file_patches)} patches with base {base}")
+        file_patches.update(parse_diff_output(result.stdout))
 
-    # Check for existing patches
-    if not force and not check_overwrite(ctx, file_patches, verbose):
-        return 0
+    if verbose:
+        for file_path in changed_files:
+            if file_path not in file_patches:
+                log_info(f"  No diff from base for: {file_path}")
 
-    # Write patches
-    return write_patches(ctx, file_patches, verbose, include_binary)
+    return file_patches
 
 
 def check_overwrite(ctx: BuildContext, file_patches: Dict, verbose: bool) -> bool:
@@ -392,6 +509,7 @@ def write_patches(
     success_count = 0
     fail_count = 0
     skip_count = 0
+    created_dirs: Set[Path] = set()
 
     for file_path, patch in file_patches.items():
         if verbose:
@@ -401,7 +519,7 @@ def write_patches(
         # Handle different operations
         if patch.operation == FileOperation.DELETE:
             # Create deletion marker
-            if create_deletion_marker(ctx, file_path):
+            if create_deletion_marker(ctx, file_path, created_dirs):
                 success_count += 1
             else:
                 fail_count += 1
@@ -409,7 +527,7 @@ def write_patches(
         elif patch.is_binary:
             if include_binary:
                 # Create binary marker
-                if create_binary_marker(ctx, file_path, patch.operation):
+                if create_binary_marker(ctx, file_path, patch.operation, created_dirs):
                     success_count += 1
                 else:
                     fail_count += 1
@@ -421,7 +539,7 @@ def write_patches(
             # Write patch with rename info
             if patch.patch_content:
                 # If there are changes beyond the rename
-                if write_patch_file(ctx, file_path, patch.patch_content):
+                if write_patch_file(ctx, file_path, patch.patch_content, created_dirs):
                     success_count += 1
                 else:
                     fail_count += 1
@@ -429,7 +547,7 @@ def write_patches(
                 # Pure rename - create marker
                 marker_path = ctx.get_dev_patches_dir() / file_path
                 marker_path = marker_path.with_suffix(marker_path.suffix + ".rename")
-                marker_path.parent.mkdir(parents=True, exist_ok=True)
+                ensure_parent_dir(marker_path, created_dirs)
                 try:
                     marker_content = f"Renamed from: {patch.old_path}\nSimilarity: {patch.similarity}%\n"
                     marker_path.write_text(marker_content)
@@ -442,7 +560,7 @@ def write_patches(
         else:
             # Normal patch (ADD, MODIFY, COPY)
             if patch.patch_content:
-                if write_patch_file(ctx, file_path, patch.patch_content):
+                if write_patch_file(ctx, file_path, patch.patch_content, created_dirs):
                     success_count += 1
                 else:
                     fail_count += 1
@@ -503,16 +621,17 @@ def extract_commit_range(
             "git",
             "diff",
             "--name-only",
+            "-z",
             f"{base_commit}..{head_commit}",
         ]
-        result = run_git_command(range_files_cmd, cwd=ctx.chromium_src)
+        result = run_git_command(
+            range_files_cmd, cwd=ctx.chromium_src, capture_bytes=True
+        )
 
         if result.returncode != 0:
             raise GitError(f"Failed to get changed files: {result.stderr}")
 
-        changed_files = (
-            result.stdout.strip().split("\n") if result.stdout.strip() else []
-        )
+        changed_files = split_path_list(result.stdout)
 
         if not changed_files:
             log_warning("No files changed in range")
@@ -533,7 +652,9 @@ def extract_commit_range(
         if include_binary:
             diff_cmd.append("--binary")
 
-    result = run_git_command(diff_cmd, cwd=ctx.chromium_src, timeout=120)
+    result = run_git_command(
+        diff_cmd, cwd=ctx.chromium_src, timeout=120, capture_bytes=True
+    )
 
     if result.returncode != 0:
         raise GitError(f"Failed to get diff for range: {result.stderr}")
@@ -552,6 +673,7 @@ def extract_commit_range(
     success_count = 0
     fail_count = 0
     skip_count = 0
+    created_dirs: Set[Path] = set()
 
     # Process with progress indicator
     with click.progressbar(
@@ -563,14 +685,16 @@ def extract_commit_range(
         for file_path, patch in patches_bar:
             # Handle different operations
             if patch.operation == FileOperation.DELETE:
-                if create_deletion_marker(ctx, file_path):
+                if create_deletion_marker(ctx, file_path, created_dirs):
                     success_count += 1
                 else:
                     fail_count += 1
 
             elif patch.is_binary:
                 if include_binary:
-                    if create_binary_marker(ctx, file_path, patch.operation):
+                    if create_binary_marker(
+                        ctx, file_path, patch.operation, created_dirs
+                    ):
                         success_count += 1
                     else:
                         fail_count += 1
@@ -578,7 +702,7 @@ def extract_commit_range(
                     skip_count += 1
 
             elif patch.patch_content:
-                if write_patch_file(ctx, file_path, patch.patch_content):
+                if write_patch_file(ctx, file_path, patch.patch_content, created_dirs):
                     success_count += 1
                 else:
                     fail_count += 1
@@ -608,6 +732,10 @@ def extract_commits_individually(
     """Extract patches from each commit in a range individually
 
     This preserves commit boundaries and can help with conflict resolution.
+    Patches from all commits are collected first and each patch file is
+    written once at the end, so a file touched by several commits is not
+    rewritten per commit. As before, a later commit's patch for a file
+    replaces an earlier one.
 
     Returns:
         Total number of patches successfully extracted
@@ -635,7 +763,7 @@ def extract_commits_individually(
     if custom_base:
         log_info(f"Using custom base: {custom_base}")
 
-    total_extracted = 0
+    file_patches: Dict[str, FilePatch] = {}
     failed_commits = []
 
     with click.progressbar(
@@ -644,25 +772,18 @@ def extract_commits_individually(
         for commit in commits_bar:
             try:
                 if custom_base:
-                    # Use extract_with_base for full diff from custom base
-                    extracted = extract_with_base(
+                    # Full diff from custom base for files in this commit
+                    commit_patches = collect_patches_with_base(
                         ctx,
                         commit,
                         custom_base,
                         verbose=False,
-                        force=force,
                         include_binary=include_binary,
                     )
                 else:
                     # Normal extraction from parent
-                    extracted = extract_single_commit(
-                        ctx,
-                        commit,
-                        verbose=False,
-                        force=force,
-                        include_binary=include_binary,
-                    )
-                total_extracted += extracted
+                    commit_patches = collect_patches_normal(ctx, commit, include_binary)
+                file_patches.update(commit_patches)
             except GitError as e:
                 failed_commits.append((commit, str(e)))
                 if verbose:
@@ -675,4 +796,12 @@ def extract_commits_individually(
         if len(failed_commits) > 5:
             log_warning(f"  ... and {len(failed_commits) - 5} more")
 
-    return total_extracted
+    if not file_patches:
+        log_warning("No changes found in commit range")
+        return 0
+
+    # Check for existing patches
+    if not force and not check_overwrite(ctx, file_patches, verbose):
+        return 0
+
+    return write_patches(ctx, file_patches, verbose, include_binary)
@@ -0,0 +1,127 @@
+"""
+Patch index - Cached listing of per-file patches
+
+Walks the chromium_patches/ mirror once per process and shares the result
+between commands instead of rescanning the tree each time it is needed.
+"""
+
+import os
+from collections import Counter
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+# Marker files written by extract that are not real patches
+MARKER_SUFFIXES = (".deleted", ".binary", ".rename")
+
+# Directory names never descended into when scanning for patches
+DEFAULT_PRUNE_DIRS = frozenset({".git", "node_modules"})
+
+
+def scandir_patches(
+    path: str, prune_dirs: FrozenSet[str] = frozenset()
+) -> Iterator[Tuple[str, int]]:
+    """Recursively yield (path, size) for patch files under a directory.
+
+    Uses os.scandir so file type checks come from the cached DirEntry
+    instead of an extra stat() per file, and yields plain strings to avoid
+    building a Path object for every entry. Directories named in
+    prune_dirs are skipped without being opened.
+
+    The size comes from DirEntry.stat(), which is free on Windows but is
+    one stat() call per patch on POSIX. It is paid once during the walk
+    (and cached with the listing by PatchIndex) so scheduling can order
+    patches by size without stat-ing them again.
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name in prune_dirs:
+                        continue
+                    yield from scandir_patches(entry.path, prune_dirs)
+                elif (
+                    entry.is_file()
+                    and not entry.name.endswith(MARKER_SUFFIXES)
+                    and not entry.name.startswith(".")
+                ):
+                    yield entry.path, entry.stat().st_size
+    except (PermissionError, FileNotFoundError):
+        return
+
+
+class PatchTree:
+    """Number of patches under every directory of a patches tree.
+
+    Built bottom-up in one pass over a patch listing, so asking whether a
+    Chromium directory has local patches is a dict lookup instead of a walk.
+    """
+
+    def __init__(self, root: Path, entries: Iterable[Tuple[str, int]]):
+        self._counts: Counter = Counter()
+
+        prefix_len = len(str(root)) + 1
+        for entry, _ in entries:
+            parts = entry[prefix_len:].split(os.sep)
+            # Count the patch for the root and each of its ancestor directories
+            for depth in range(len(parts)):
+                self._counts[tuple(parts[:depth])] += 1
+
+    @staticmethod
+    def _key(directory: str) -> Tuple[str, ...]:
+        return tuple(p for p in directory.replace("\\", "/").split("/") if p)
+
+    def patch_count(self, directory: str = "") -> int:
+        """Number of patches under a directory, e.g. 'chrome/browser/ui'"""
+        return self._counts.get(self._key(directory), 0)
+
+    def has_patches(self, directory: str = "") -> bool:
+        """Whether any patch exists under a directory"""
+        return self._key(directory) in self._counts
+
+
+class PatchIndex:
+    """Memoized patch listing keyed by patches directory.
+
+    A cached walk is reused as long as the root directory's mtime is
+    unchanged. Writes deeper in the tree do not touch the root mtime, so
+    anything that adds or removes patches should call invalidate().
+    """
+
+    def __init__(self):
+        self._entries: Dict[
+            Tuple[str, FrozenSet[str]], Tuple[int, List[Tuple[str, int]]]
+        ] = {}
+
+    def entries(
+        self, root: Path, prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS
+    ) -> List[Tuple[str, int]]:
+        """Return sorted (path, size) entries under root, walking it at most once"""
+        key = (str(root), frozenset(prune_dirs))
+
+        try:
+            mtime_ns = os.stat(key[0]).st_mtime_ns
+        except FileNotFoundError:
+            return []
+
+        cached = self._entries.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        entries = sorted(scandir_patches(*key))
+        self._entries[key] = (mtime_ns, entries)
+        return entries
+
+    def tree(
+        self, root: Path, prune_dirs: Iterable[str] = DEFAULT_PRUNE_DIRS
+    ) -> PatchTree:
+        """Build a PatchTree for root from the cached listing"""
+        return PatchTree(root, self.entries(root, prune_dirs))
+
+    def invalidate(self, root: Optional[Path] = None):
+        """Drop cached walks for root, or for every directory if not given"""
+        if root is None:
+            self._entries.clear()
+            return
+
+        for key in [k for k in self._entries if k[0] == str(root)]:
+            del self._entries[key]
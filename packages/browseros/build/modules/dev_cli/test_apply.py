@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test script for patch application helpers
+
+This script tests patch discovery and that batched patch application
+splits patches into balanced, size-capped batches.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from modules.dev_cli.apply import find_patch_files, schedule_patch_batches
+
+
+def _make_patches(sizes):
+    """Build (patch_path, display_name) tuples and a size map"""
+    patches = [(Path(f"p{i}"), f"p{i}") for i in range(len(sizes))]
+    patch_sizes = {path: size for (path, _), size in zip(patches, sizes)}
+    return patches, patch_sizes
+
+
+def _total(batch, patch_sizes):
+    return sum(patch_sizes[path] for path, _ in batch)
+
+
+def test_lpt_totals_and_order():
+    """Test that batches are balanced and returned largest first"""
+    patches, patch_sizes = _make_patches([9, 1, 8, 2, 7, 3, 6, 4, 5, 5])
+
+    batches = schedule_patch_batches(patches, 4, patch_sizes)
+
+    assert len(batches) == 3
+    totals = [_total(batch, patch_sizes) for batch in batches]
+    assert totals == [17, 17, 16]
+    assert totals == sorted(totals, reverse=True)
+    # Largest patches start the batches, one per batch
+    assert [batch[0][1] for batch in batches] == ["p0", "p2", "p4"]
+    print("✓ LPT totals and order test passed")
+
+
+def test_every_patch_scheduled_once():
+    """Test that no patch is dropped or duplicated"""
+    patches, patch_sizes = _make_patches([3, 3, 3, 3, 3])
+
+    batches = schedule_patch_batches(patches, 2, patch_sizes)
+
+    scheduled = sorted(name for batch in batches for _, name in batch)
+    assert scheduled == sorted(name for _, name in patches)
+    assert all(batches)
+    print("✓ Every patch scheduled once test passed")
+
+
+def test_batch_size_cap():
+    """Test that skewed sizes do not grow batches past batch_size"""
+    # A few huge patches would otherwise leave the small ones piling up
+    # in the remaining batches
+    patches, patch_sizes = _make_patches([1000] * 4 + [1] * 60)
+
+    batches = schedule_patch_batches(patches, 8, patch_sizes)
+
+    assert len(batches) == 8
+    assert all(len(batch) <= 8 for batch in batches)
+    assert sum(len(batch) for batch in batches) == 64
+    print("✓ Batch size cap test passed")
+
+
+def test_find_patch_files_subpath():
+    """Test that subpath limits the search to a directory in patches_dir"""
+    with tempfile.TemporaryDirectory() as tmp:
+        patches_dir = Path(tmp) / "chromium_patches"
+        (patches_dir / "chrome" / "browser").mkdir(parents=True)
+        (patches_dir / "chrome" / "browser" / "a.cc").write_text("a\n")
+        (patches_dir / "base" / "b.cc").parent.mkdir()
+        (patches_dir / "base" / "b.cc").write_text("b\n")
+        (Path(tmp) / "outside.cc").write_text("x\n")
+
+        result = find_patch_files(patches_dir, "chrome/../chrome")
+        assert result == [patches_dir / "chrome" / "browser" / "a.cc"]
+
+        for subpath in ("..", "chrome/../..", tmp, "base/b.cc"):
+            try:
+                find_patch_files(patches_dir, subpath)
+            except ValueError:
+                continue
+            raise AssertionError(f"subpath {subpath!r} was not rejected")
+    print("✓ Find patch files subpath test passed")
+
+
+def run_all_tests():
+    """Run all test cases"""
+    tests = [
+        test_lpt_totals_and_order,
+        test_every_patch_scheduled_once,
+        test_batch_size_cap,
+        test_find_patch_files_subpath,
+    ]
+
+    print("Running apply tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -6,13 +6,42 @@ This script tests various edge cases for the diff parser to ensure
 it handles all types of git diff outputs correctly.
 """
 
+import os
+import subprocess
 import sys
+import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from modules.dev_cli.utils import parse_diff_output, FilePatch, FileOperation
+from modules.dev_cli.utils import (
+    run_git_command,
+    parse_diff_output,
+    parse_diff_file,
+    get_commit_changed_files,
+    FilePatch,
+    FileOperation,
+)
+from modules.dev_cli import extract
+from modules.dev_cli.extract import (
+    collect_patches_normal,
+    collect_patches_with_base,
+    group_paths,
+)
+
+
+def _git(repo: Path, *args: str):
+    """Run a git command in a scratch repository"""
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _init_repo(repo: Path):
+    """Create a scratch repository with a committer identity"""
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test")
 
 
 def test_regular_modify():
@@ -215,6 +244,47 @@ index abc123..def456 100644
     print("✓ Complex path test passed")
 
 
+def test_path_with_spaces():
+    """Test paths containing spaces and ' b/' sequences"""
+    diff = """diff --git a/dir b/my file.txt b/dir b/my file.txt
+index abc123..def456 100644
+--- a/dir b/my file.txt
++++ b/dir b/my file.txt
+@@ -1 +1 @@
+-old
++new"""
+
+    result = parse_diff_output(diff)
+    assert len(result) == 1
+    assert "dir b/my file.txt" in result
+    print("✓ Path with spaces test passed")
+
+
+def test_quoted_path():
+    """Test headers that git C-quoted for special characters"""
+    diff = r"""diff --git "a/caf\303\251.txt" "b/caf\303\251.txt"
+new file mode 100644
+--- /dev/null
++++ "b/caf\303\251.txt"
+@@ -0,0 +1 @@
++x
+diff --git "a/tab\tname \"q\".txt" "b/tab\tname \"q\".txt"
+new file mode 100644
+diff --git "a/caf\351 old.txt" b/plain.txt
+similarity index 100%
+rename from "caf\351 old.txt"
+rename to plain.txt"""
+
+    result = parse_diff_output(diff)
+    assert sorted(result) == sorted(["café.txt", 'tab\tname "q".txt', "plain.txt"])
+    assert result["café.txt"].operation == FileOperation.ADD
+    patch = result["plain.txt"]
+    assert patch.operation == FileOperation.RENAME
+    # Not valid UTF-8, decoded the same way as names from git -z output
+    assert patch.old_path == os.fsdecode(b"caf\xe9 old.txt")
+    print("✓ Quoted path test passed")
+
+
 def test_empty_diff():
     """Test empty diff handling"""
     diff = ""
@@ -261,6 +331,243 @@ copy to copy.txt"""
     print("✓ Copied file test passed")
 
 
+def test_type_change():
+    """Test a path with two blocks (symlink replaced by a file)"""
+    diff = """diff --git a/link b/link
+deleted file mode 120000
+index abc123..0000000
+--- a/link
++++ /dev/null
+@@ -1 +0,0 @@
+-target
+\\ No newline at end of file
+diff --git a/link b/link
+new file mode 100644
+index 0000000..def456
+--- /dev/null
++++ b/link
+@@ -0,0 +1 @@
++content"""
+
+    result = parse_diff_output(diff)
+    assert len(result) == 1
+    assert "link" in result
+    patch = result["link"]
+    assert patch.operation == FileOperation.ADD
+    assert patch.patch_content == diff
+    print("✓ Type change test passed")
+
+
+def test_bytes_input():
+    """Test that bytes input keeps patch content byte-for-byte"""
+    diff = (
+        b"diff --git a/file.txt b/file.txt\n"
+        b"index abc123..def456 100644\n"
+        b"--- a/file.txt\n"
+        b"+++ b/file.txt\n"
+        b"@@ -1,2 +1,2 @@\n"
+        b" caf\xe9\r\n"
+        b"-old\r\n"
+        b"+new\r\n"
+    )
+
+    result = parse_diff_output(diff)
+    assert len(result) == 1
+    assert "file.txt" in result
+    patch = result["file.txt"]
+    assert patch.operation == FileOperation.MODIFY
+    assert patch.patch_content == diff[:-1]
+    print("✓ Bytes input test passed")
+
+
+def test_renamed_commit():
+    """Test that extracting a commit with git mv yields a rename"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        _init_repo(repo)
+        (repo / "a.txt").write_text("line1\nline2\nline3\n")
+        _git(repo, "add", "a.txt")
+        _git(repo, "commit", "-q", "-m", "base")
+        _git(repo, "mv", "a.txt", "b.txt")
+        _git(repo, "commit", "-q", "-m", "rename")
+
+        ctx = SimpleNamespace(chromium_src=repo)
+        result = collect_patches_normal(ctx, "HEAD", include_binary=False)
+
+    assert list(result) == ["b.txt"]
+    patch = result["b.txt"]
+    assert patch.operation == FileOperation.RENAME
+    assert patch.old_path == "a.txt"
+    assert patch.similarity == 100
+    print("✓ Renamed commit test passed")
+
+
+def test_non_utf8_changed_files():
+    """Test that a non-UTF-8 file name does not hide a commit's files"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        _init_repo(repo)
+        _git(repo, "commit", "-q", "--allow-empty", "-m", "base")
+        (repo / "ok.txt").write_text("ok\n")
+        (repo / os.fsdecode(b"caf\xe9.txt")).write_text("latin-1 name\n")
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "add files")
+
+        result = get_commit_changed_files("HEAD", repo)
+
+        assert sorted(result) == sorted(["ok.txt", os.fsdecode(b"caf\xe9.txt")])
+        # Decoded names still point at the files on disk
+        assert all((repo / f).exists() for f in result)
+
+        # Extracting the commit keys a patch by the same name
+        ctx = SimpleNamespace(chromium_src=repo)
+        for patches in (
+            collect_patches_normal(ctx, "HEAD", include_binary=False),
+            collect_patches_with_base(
+                ctx, "HEAD", "HEAD~1", verbose=False, include_binary=False
+            ),
+        ):
+            assert sorted(patches) == sorted(result)
+            patch = patches[os.fsdecode(b"caf\xe9.txt")]
+            assert patch.operation == FileOperation.ADD
+            assert b"+latin-1 name" in patch.patch_content
+    print("✓ Non-UTF-8 changed files test passed")
+
+
+def test_git_output_types():
+    """Test that empty git output keeps the requested str/bytes type"""
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        _init_repo(repo)
+        cmd = ["git", "hash-object", "--stdin"]
+
+        result = run_git_command(cmd, cwd=repo, input_data=b"x\n")
+        assert isinstance(result.stdout, str) and result.stdout.strip()
+        assert result.stderr == ""
+
+        # No output at all, from text and bytes modes
+        cmd = ["git", "diff", "--stat"]
+        assert run_git_command(cmd, cwd=repo, input_data=b"").stdout == ""
+        result = run_git_command(cmd, cwd=repo, capture_bytes=True)
+        assert result.stdout == b""
+        assert result.stderr == ""
+    print("✓ Git output types test passed")
+
+
+def test_parse_diff_file():
+    """Test parsing a patch file on disk through mmap"""
+    diff = (
+        b"diff --git a/file.txt b/file.txt\n"
+        b"--- a/file.txt\n"
+        b"+++ b/file.txt\n"
+        b"@@ -1 +1 @@\n"
+        b"-caf\xe9\n"
+        b"+new\n"
+        b"diff --git a/other.txt b/other.txt\n"
+        b"deleted file mode 100644\n"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        patch_file = Path(tmp) / "change.patch"
+        patch_file.write_bytes(diff)
+        result = parse_diff_file(patch_file)
+
+    assert list(result) == ["file.txt", "other.txt"]
+    assert result["file.txt"].operation == FileOperation.MODIFY
+    assert result["file.txt"].patch_content == diff[: diff.index(b"diff --git a/o") - 1]
+    assert result["other.txt"].operation == FileOperation.DELETE
+    print("✓ Parse diff file test passed")
+
+
+def test_parse_empty_diff_file():
+    """Test that an empty patch file parses to nothing"""
+    with tempfile.TemporaryDirectory() as tmp:
+        patch_file = Path(tmp) / "empty.patch"
+        patch_file.write_bytes(b"")
+        result = parse_diff_file(patch_file)
+
+    assert result == {}
+    print("✓ Parse empty diff file test passed")
+
+
+def test_crlf_diff_file():
+    """Test that CRLF line endings do not end up in file paths"""
+    diff = (
+        b"diff --git a/chrome/VERSION b/chrome/VERSION\r\n"
+        b"index abc123..def456 100644\r\n"
+        b"--- a/chrome/VERSION\r\n"
+        b"+++ b/chrome/VERSION\r\n"
+        b"@@ -1 +1 @@\r\n"
+        b"-MAJOR=1\r\n"
+        b"+MAJOR=2\r\n"
+        b"diff --git a/old.txt b/new.txt\r\n"
+        b"similarity index 100%\r\n"
+        b"rename from old.txt\r\n"
+        b"rename to new.txt\r\n"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        patch_file = Path(tmp) / "crlf.patch"
+        patch_file.write_bytes(diff)
+        result = parse_diff_file(patch_file)
+
+    assert list(result) == ["chrome/VERSION", "new.txt"]
+    assert result["chrome/VERSION"].operation == FileOperation.MODIFY
+    patch = result["new.txt"]
+    assert patch.operation == FileOperation.RENAME
+    assert patch.old_path == "old.txt"
+    assert patch.similarity == 100
+    print("✓ CRLF diff file test passed")
+
+
+def test_group_paths():
+    """Test that path groups stay within the character budget"""
+    paths = ["a" * 9, "b" * 9, "c" * 9, "d" * 30]
+
+    groups = group_paths(paths, 20)
+
+    # Each path costs its length plus a separating space
+    assert groups == [["a" * 9, "b" * 9], ["c" * 9], ["d" * 30]]
+    assert group_paths([], 20) == []
+    print("✓ Group paths test passed")
+
+
+def test_base_diff_in_groups():
+    """Test extracting with a base across several git diff calls"""
+    names = ["one.txt", "two.txt", "three.txt", "a[1].txt", "b*.txt"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        _init_repo(repo)
+        for name in names + ["a1.txt", "b2.txt"]:
+            (repo / name).write_text("base\n")
+        _git(repo, "add", "-A")
+        _git(repo, "commit", "-q", "-m", "base")
+
+        # Files that a glob would match but the commit does not touch
+        (repo / "a1.txt").write_text("earlier\n")
+        (repo / "b2.txt").write_text("earlier\n")
+        _git(repo, "commit", "-q", "-am", "earlier")
+
+        for name in names:
+            (repo / name).write_text("changed\n")
+        _git(repo, "commit", "-q", "-am", "change")
+
+        ctx = SimpleNamespace(chromium_src=repo)
+        budget = extract.DIFF_PATHSPEC_BUDGET
+        extract.DIFF_PATHSPEC_BUDGET = 12
+        try:
+            result = collect_patches_with_base(
+                ctx, "HEAD", "HEAD~2", verbose=False, include_binary=False
+            )
+        finally:
+            extract.DIFF_PATHSPEC_BUDGET = budget
+
+    assert sorted(result) == sorted(names)
+    assert all(p.operation == FileOperation.MODIFY for p in result.values())
+    print("✓ Base diff in groups test passed")
+
+
 def run_all_tests():
     """Run all test cases"""
     tests = [
@@ -273,9 +580,21 @@ def run_all_tests():
         test_multiple_files,
         test_no_newline_marker,
         test_complex_path,
+        test_path_with_spaces,
+        test_quoted_path,
         test_empty_diff,
         test_mode_change,
         test_copied_file,
+        test_type_change,
+        test_bytes_input,
+        test_renamed_commit,
+        test_non_utf8_changed_files,
+        test_git_output_types,
+        test_parse_diff_file,
+        test_parse_empty_diff_file,
+        test_crlf_diff_file,
+        test_group_paths,
+        test_base_diff_in_groups,
     ]
 
     print("Running diff parser tests...")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the patch index
+
+This script tests the cached patch listing and the per-directory patch
+counts built from it.
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from modules.dev_cli.patch_index import PatchIndex
+
+
+def _make_patches_dir(root: Path) -> Path:
+    """Create a small chromium_patches/ tree"""
+    patches_dir = root / "chromium_patches"
+    files = [
+        "chrome/browser/ui/a.cc",
+        "chrome/browser/ui/b.cc",
+        "chrome/browser/c.cc",
+        "base/d.h",
+        # Markers, dotfiles and pruned directories are not patches
+        "base/gone.cc.deleted",
+        "chrome/.hidden",
+        "node_modules/pkg/e.js",
+    ]
+    for name in files:
+        path = patches_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("patch\n")
+    return patches_dir
+
+
+def test_tree_counts():
+    """Test patch counts for the root and nested directories"""
+    with tempfile.TemporaryDirectory() as tmp:
+        patches_dir = _make_patches_dir(Path(tmp))
+        tree = PatchIndex().tree(patches_dir)
+
+    assert tree.patch_count() == 4
+    assert tree.patch_count("chrome") == 3
+    assert tree.patch_count("chrome/browser") == 3
+    assert tree.patch_count("chrome/browser/ui") == 2
+    assert tree.patch_count("base") == 1
+    assert tree.patch_count("node_modules") == 0
+    assert tree.patch_count("content") == 0
+    print("✓ Tree counts test passed")
+
+
+def test_tree_has_patches():
+    """Test directory lookups with trailing and doubled separators"""
+    with tempfile.TemporaryDirectory() as tmp:
+        patches_dir = _make_patches_dir(Path(tmp))
+        tree = PatchIndex().tree(patches_dir)
+
+    assert tree.has_patches()
+    assert tree.has_patches("chrome/browser/")
+    assert tree.has_patches("chrome//browser/ui/")
+    assert tree.has_patches("chrome\\browser")
+    assert not tree.has_patches("chrome/renderer/")
+    print("✓ Tree has_patches test passed")
+
+
+def test_tree_file_path():
+    """Test that a patch file path is not counted as a directory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        patches_dir = _make_patches_dir(Path(tmp))
+        tree = PatchIndex().tree(patches_dir)
+
+    assert tree.patch_count("chrome/browser/c.cc") == 0
+    assert not tree.has_patches("base/d.h")
+    print("✓ Tree file path test passed")
+
+
+def test_index_invalidate():
+    """Test that invalidate() picks up patches added deeper in the tree"""
+    with tempfile.TemporaryDirectory() as tmp:
+        patches_dir = _make_patches_dir(Path(tmp))
+        index = PatchIndex()
+        assert len(index.entries(patches_dir)) == 4
+
+        # A nested write does not change the root mtime
+        (patches_dir / "chrome" / "browser" / "f.cc").write_text("patch\n")
+        assert len(index.entries(patches_dir)) == 4
+
+        index.invalidate(patches_dir)
+        assert len(index.entries(patches_dir)) == 5
+    print("✓ Index invalidate test passed")
+
+
+def run_all_tests():
+    """Run all test cases"""
+    tests = [
+        test_tree_counts,
+        test_tree_has_patches,
+        test_tree_file_path,
+        test_index_invalidate,
+    ]
+
+    print("Running patch index tests...")
+    print("=" * 60)
+
+    failed_tests = []
+    for test in tests:
+        try:
+            test()
+        except Exception as e:
+            test_name = test.__name__
+            print(f"✗ {test_name} failed: {e}")
+            failed_tests.append((test_name, str(e)))
+
+    print("=" * 60)
+    if failed_tests:
+        print(f"\n{len(failed_tests)} tests failed:")
+        for name, error in failed_tests:
+            print(f"  - {name}: {error}")
+        return False
+    else:
+        print(f"\nAll {len(tests)} tests passed!")
+        return True
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -5,13 +5,15 @@ This module provides robust utilities for git operations, diff parsing,
 and patch management with comprehensive error handling.
 """
 
+import mmap
+import os
 import subprocess
 import sys
 import time
 import click
 import re
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple, NamedTuple
+from typing import Iterator, Optional, List, Dict, Set, Tuple, NamedTuple, Union
 from enum import Enum
 from dataclasses import dataclass
 from context import BuildContext
@@ -36,7 +38,7 @@ class FilePatch:
     file_path: str
     operation: FileOperation
     old_path: Optional[str] = None  # For renames/copies
-    patch_content: Optional[str] = None
+    patch_content: Optional[Union[str, bytes]] = None  # bytes if parsed from bytes
     is_binary: bool = False
     similarity: Optional[int] = None  # For renames (percentage)
 
@@ -54,6 +56,8 @@ def run_git_command(
     check: bool = False,
     timeout: Optional[int] = None,
     binary_output: bool = False,
+    input_data: Optional[bytes] = None,
+    capture_bytes: bool = False,
 ) -> subprocess.CompletedProcess:
     """Run a git command and return the result
 
@@ -64,6 +68,8 @@ def run_git_command(
         check: Whether to raise on non-zero return
         timeout: Command timeout in seconds
         binary_output: If True, handle binary output (don't decode as text)
+        input_data: Raw bytes to pass to the command on stdin
+        capture_bytes: If True, return stdout as raw bytes without decoding
 
     Returns:
         CompletedProcess result
@@ -72,9 +78,25 @@ def run_git_command(
         GitError: If command fails and check=True
     """
     try:
+        if input_data is not None or capture_bytes:
+            # stdin and/or stdout are raw bytes, so run in binary mode and
+            # decode afterwards whatever the caller wants as text
+            result = subprocess.run(
+                cmd,
+                cwd=cwd,
+                input=input_data,
+                capture_output=capture,
+                check=False,
+                timeout=timeout or 60,
+            )
+            # Empty output is decoded too so text callers always get str
+            if result.stdout is not None and not capture_bytes:
+                result.stdout = result.stdout.decode("utf-8", errors="replace")
+            if result.stderr is not None:
+                result.stderr = result.stderr.decode("utf-8", errors="replace")
         # For commands that might output binary data (like git diff with binary files),
         # we need to handle them specially
-        if binary_output or ("diff" in cmd and "--binary" not in cmd):
+        elif binary_output or ("diff" in cmd and "--binary" not in cmd):
             # First try with text mode
             try:
                 result = subprocess.run(
@@ -124,15 +146,30 @@ def run_git_command(
         raise GitError(f"Command failed: {e}")
 
 
+# Results of validate_git_repository, keyed by resolved path
+_git_repo_cache: Dict[Path, bool] = {}
+
+
 def validate_git_repository(path: Path) -> bool:
-    """Validate that a path is a git repository"""
+    """Validate that a path is a git repository
+
+    The result is cached for the life of the process, so repeated
+    extractions against the same checkout only run git rev-parse once.
+    """
+    path = Path(path).resolve()
+    if path in _git_repo_cache:
+        return _git_repo_cache[path]
+
     try:
         result = run_git_command(
             ["git", "rev-parse", "--git-dir"], cwd=path, check=False
         )
-        return result.returncode == 0
+        is_repo = result.returncode == 0
     except GitError:
-        return False
+        is_repo = False
+
+    _git_repo_cache[path] = is_repo
+    return is_repo
 
 
 def validate_commit_exists(commit_hash: str, chromium_src: Path) -> bool:
@@ -152,26 +189,206 @@ def validate_commit_exists(commit_hash: str, chromium_src: Path) -> bool:
         return False
 
 
+def split_path_list(output: bytes) -> List[str]:
+    """Split NUL-separated git path output (-z) into file paths.
+
+    With -z git prints paths verbatim rather than quoted, so they are
+    decoded with os.fsdecode. Names that are not valid UTF-8 survive as
+    surrogate escapes and still match the file when passed back to git.
+    """
+    return [os.fsdecode(f) for f in output.split(b"\0") if f]
+
+
 def get_commit_changed_files(commit_hash: str, chromium_src: Path) -> List[str]:
     """Get list of files changed in a commit"""
     try:
         result = run_git_command(
-            ["git", "diff-tree", "--no-commit-id", "--name-only", "-r", commit_hash],
+            [
+                "git",
+                "diff-tree",
+                "--no-commit-id",
+                "--name-only",
+                "-r",
+                "-z",
+                commit_hash,
+            ],
             cwd=chromium_src,
+            capture_bytes=True,
         )
 
         if result.returncode != 0:
             log_error(f"Failed to get changed files for commit {commit_hash}")
             return []
 
-        files = [f.strip() for f in result.stdout.strip().split("\n") if f.strip()]
-        return files
+        return split_path_list(result.stdout)
     except GitError as e:
         log_error(f"Error getting changed files: {e}")
         return []
 
 
-def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
+# Start of every per-file block in a git diff
+DIFF_BLOCK_START = "diff --git "
+DIFF_BLOCK_START_BYTES = b"diff --git "
+
+# Header line prefix of a per-file block, up to the old path
+DIFF_HEADER_PREFIX = "diff --git a/"
+DIFF_HEADER_PREFIX_LEN = len(DIFF_HEADER_PREFIX)
+
+SIMILARITY_RE = re.compile(r"similarity index (\d+)%")
+
+
+# Single-character escapes git uses in C-quoted paths
+C_QUOTE_ESCAPES = {
+    "a": b"\a",
+    "b": b"\b",
+    "t": b"\t",
+    "n": b"\n",
+    "v": b"\v",
+    "f": b"\f",
+    "r": b"\r",
+    '"': b'"',
+    "\\": b"\\",
+}
+
+
+def unquote_c_path(quoted: str) -> str:
+    """Decode a path git printed C-quoted, e.g. '"caf\\303\\251.txt"'.
+
+    git quotes paths containing non-ASCII bytes, control characters,
+    quotes or backslashes, writing raw bytes as octal escapes. The bytes
+    are rebuilt and decoded with os.fsdecode, so the result matches the
+    names returned by split_path_list.
+    """
+    body = quoted[1:-1] if quoted.startswith('"') else quoted
+    out = bytearray()
+    i = 0
+    while i < len(body):
+        char = body[i]
+        if char != "\\" or i + 1 == len(body):
+            out += char.encode("utf-8", errors="surrogateescape")
+            i += 1
+        elif body[i + 1] in C_QUOTE_ESCAPES:
+            out += C_QUOTE_ESCAPES[body[i + 1]]
+            i += 2
+        else:
+            # Octal escape for a raw byte, always three digits
+            out.append(int(body[i + 1 : i + 4], 8))
+            i += 4
+    return os.fsdecode(bytes(out))
+
+
+def _detect_patch_target_path(header: str) -> Optional[str]:
+    """Get the b/ path from a 'diff --git a/<old> b/<new>' header line.
+
+    Paths may contain spaces, so splitting on whitespace is not enough.
+    Unless the block is a rename or copy both sides name the same file,
+    in which case the separator sits exactly in the middle of the line.
+    Sides that git C-quoted are unquoted.
+    """
+    # Patch files edited on Windows may have CRLF line endings
+    if header.endswith("\r"):
+        header = header[:-1]
+
+    # A quoted b/ side. Quotes inside a quoted path are escaped, so the
+    # last ' "b/' is where it starts.
+    if header.endswith('"') and header.startswith(DIFF_BLOCK_START):
+        sep = header.rfind(' "b/')
+        if sep == -1:
+            return None
+        return unquote_c_path(header[sep + 1 :])[2:]
+
+    # A quoted a/ side with a plain b/ side, e.g. a rename to a plain name
+    if header.startswith(DIFF_BLOCK_START + '"a/'):
+        sep = header.find('" b/')
+        if sep == -1:
+            return None
+        return header[sep + 4 :]
+
+    if header[:DIFF_HEADER_PREFIX_LEN] != DIFF_HEADER_PREFIX:
+        return None
+
+    paths = header[DIFF_HEADER_PREFIX_LEN:]
+
+    half = (len(paths) - 3) // 2
+    if paths[half : half + 3] == " b/" and paths[:half] == paths[half + 3 :]:
+        return paths[half + 3 :]
+
+    # Renames and copies: fall back to the first separator
+    sep = paths.find(" b/")
+    if sep == -1:
+        return None
+    return paths[sep + 3 :]
+
+
+def _parse_diff_block(block: Union[str, bytes]) -> Optional[FilePatch]:
+    """Parse a single 'diff --git' block into a FilePatch.
+
+    Only the extended header lines before the first hunk are inspected;
+    hunk bodies are kept verbatim without being split into lines. For a
+    bytes block only those header lines are decoded, and the patch content
+    stays as the original bytes.
+    """
+    if isinstance(block, bytes):
+        newline, hunk_marker = b"\n", b"\n@@"
+    else:
+        newline, hunk_marker = "\n", "\n@@"
+
+    # Metadata never appears after the first hunk header
+    hunk_start = block.find(hunk_marker)
+    metadata = block if hunk_start == -1 else block[:hunk_start]
+    if isinstance(metadata, bytes):
+        metadata = metadata.decode("utf-8", errors="surrogateescape")
+
+    header, _, _ = metadata.partition("\n")
+    current_file = _detect_patch_target_path(header)
+    if not current_file:
+        log_warning(f"Could not parse diff line: {header}")
+        return None
+
+    operation = FileOperation.MODIFY
+    is_binary = False
+    old_path = None
+    similarity = None
+
+    for line in metadata.split("\n")[1:]:
+        if line.startswith("deleted file"):
+            operation = FileOperation.DELETE
+        elif line.startswith("new file"):
+            operation = FileOperation.ADD
+        elif line.startswith("similarity index"):
+            # Extract similarity percentage for renames
+            sim_match = SIMILARITY_RE.match(line)
+            if sim_match:
+                similarity = int(sim_match.group(1))
+        elif line.startswith("rename from"):
+            operation = FileOperation.RENAME
+            old_path = line[12:].strip()  # Remove 'rename from '
+        elif line.startswith("copy from"):
+            operation = FileOperation.COPY
+            old_path = line[10:].strip()  # Remove 'copy from '
+        elif line.startswith("Binary files"):
+            is_binary = True
+            if operation == FileOperation.MODIFY:
+                operation = FileOperation.BINARY
+
+    if old_path and old_path.startswith('"'):
+        old_path = unquote_c_path(old_path)
+
+    # Drop the block's trailing newline; write_patch_file adds it back
+    if block.endswith(newline):
+        block = block[:-1]
+
+    return FilePatch(
+        file_path=current_file,
+        operation=operation,
+        old_path=old_path,
+        patch_content=None if is_binary else block,
+        is_binary=is_binary,
+        similarity=similarity,
+    )
+
+
+def parse_diff_output(diff_output: Union[str, bytes]) -> Dict[str, FilePatch]:
     """
     Parse git diff output into individual file patches with full metadata.
 
@@ -184,131 +401,127 @@ def parse_diff_output(diff_output: str) -> Dict[str, FilePatch]:
     - File copies
     - Mode changes
 
+    The output is split into per-file blocks in a single scan rather than
+    testing every line of the diff in Python. Raw bytes are accepted so
+    patch content is never passed through a text codec.
+
+    A path can have more than one block, e.g. a symlink replaced by a
+    regular file is a deletion followed by an addition. Later blocks are
+    appended to the first one so the patch keeps every step, and the
+    operation is taken from the last block. The blocks of such a path are
+    collected and joined once at the end rather than concatenated block
+    by block.
+
     Returns:
         Dict mapping file path to FilePatch objects
     """
     patches = {}
-    current_file = None
-    current_patch_lines = []
-    current_operation = FileOperation.MODIFY
-    is_binary = False
-    old_path = None
-    similarity = None
+    # Content blocks for paths that appear more than once, in diff order
+    repeated: Dict[str, list] = {}
 
-    lines = diff_output.splitlines()
-    i = 0
+    for block in _iter_diff_blocks(diff_output):
+        patch = _parse_diff_block(block)
+        if not patch:
+            continue
 
-    while i < len(lines):
-        line = lines[i]
+        previous = patches.get(patch.file_path)
+        if previous is not None:
+            patch.is_binary = patch.is_binary or previous.is_binary
+            parts = repeated.setdefault(patch.file_path, [previous.patch_content])
+            parts.append(patch.patch_content)
 
-        # Start of a new file diff
-        if line.startswith("diff --git"):
-            # Save previous patch if exists
-            if current_file and current_patch_lines:
-                patch_content = (
-                    "\n".join(current_patch_lines) if not is_binary else None
-                )
-                patches[current_file] = FilePatch(
-                    file_path=current_file,
-                    operation=current_operation,
-                    old_path=old_path,
-                    patch_content=patch_content,
-                    is_binary=is_binary,
-                    similarity=similarity,
-                )
+        patches[patch.file_path] = patch
 
-            # Parse file paths from diff line
-            match = re.match(r"diff --git a/(.*) b/(.*)", line)
-            if match:
-                old_file = match.group(1)
-                new_file = match.group(2)
-                current_file = new_file
-                current_patch_lines = [line]
-                current_operation = FileOperation.MODIFY
-                is_binary = False
-                old_path = None
-                similarity = None
-            else:
-                log_warning(f"Could not parse diff line: {line}")
-                current_file = None
-                current_patch_lines = []
+    for file_path, parts in repeated.items():
+        patch = patches[file_path]
+        if patch.is_binary:
+            patch.patch_content = None
+        else:
+            newline = b"\n" if isinstance(parts[0], bytes) else "\n"
+            patch.patch_content = newline.join(parts)
 
-            i += 1
-            continue
+    return patches
 
-        # Check for file metadata
-        if current_file:
-            if line.startswith("deleted file"):
-                current_operation = FileOperation.DELETE
-                current_patch_lines.append(line)
-            elif line.startswith("new file"):
-                current_operation = FileOperation.ADD
-                current_patch_lines.append(line)
-            elif line.startswith("similarity index"):
-                # Extract similarity percentage for renames
-                match = re.match(r"similarity index (\d+)%", line)
-                if match:
-                    similarity = int(match.group(1))
-                current_patch_lines.append(line)
-            elif line.startswith("rename from"):
-                current_operation = FileOperation.RENAME
-                old_path = line[12:].strip()  # Remove 'rename from '
-                current_patch_lines.append(line)
-            elif line.startswith("rename to"):
-                # Confirm rename operation
-                current_patch_lines.append(line)
-            elif line.startswith("copy from"):
-                current_operation = FileOperation.COPY
-                old_path = line[10:].strip()  # Remove 'copy from '
-                current_patch_lines.append(line)
-            elif line.startswith("copy to"):
-                # Confirm copy operation
-                current_patch_lines.append(line)
-            elif line == "Binary files differ" or line.startswith("Binary files"):
-                is_binary = True
-                current_operation = (
-                    FileOperation.BINARY
-                    if current_operation == FileOperation.MODIFY
-                    else current_operation
-                )
-                current_patch_lines.append(line)
-            elif (
-                line.startswith("index ")
-                or line.startswith("---")
-                or line.startswith("+++")
-            ):
-                current_patch_lines.append(line)
-            elif line.startswith("@@"):
-                # Hunk header
-                current_patch_lines.append(line)
-            elif line.startswith("+") or line.startswith("-") or line.startswith(" "):
-                # Actual diff content
-                current_patch_lines.append(line)
-            elif line.startswith("\\"):
-                # Special markers like "\ No newline at end of file"
-                current_patch_lines.append(line)
-            else:
-                # Other content
-                current_patch_lines.append(line)
-
-        i += 1
-
-    # Save last patch
-    if current_file and current_patch_lines:
-        patch_content = "\n".join(current_patch_lines) if not is_binary else None
-        patches[current_file] = FilePatch(
-            file_path=current_file,
-            operation=current_operation,
-            old_path=old_path,
-            patch_content=patch_content,
-            is_binary=is_binary,
-            similarity=similarity,
-        )
 
-    return patches
+def find_diff_block_offsets(diff_output) -> List[int]:
+    """Return the offset of every line starting with 'diff --git '.
+
+    Uses str/bytes find(), which scans in C with memchr-style search and
+    is several times faster than a multiline regex on large diffs.
+    """
+    if isinstance(diff_output, str):
+        start_marker, needle = DIFF_BLOCK_START, "\n" + DIFF_BLOCK_START
+    else:
+        start_marker, needle = DIFF_BLOCK_START_BYTES, b"\n" + DIFF_BLOCK_START_BYTES
 
+    offsets = []
+    if diff_output[: len(start_marker)] == start_marker:
+        offsets.append(0)
 
-def write_patch_file(ctx: BuildContext, file_path: str, patch_content: str) -> bool:
+    pos = diff_output.find(needle)
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = diff_output.find(needle, pos + len(needle))
+
+    return offsets
+
+
+def _iter_diff_blocks(diff_output) -> Iterator[Union[str, bytes]]:
+    """Yield each 'diff --git' block of a diff, one slice at a time.
+
+    Only block start offsets are collected up front, so for an mmap the
+    blocks are copied out one by one instead of all at once. Anything
+    before the first 'diff --git' line is not a file diff and is skipped.
+    """
+    starts = find_diff_block_offsets(diff_output)
+    ends = starts[1:] + [len(diff_output)]
+
+    for start, end in zip(starts, ends):
+        yield diff_output[start:end]
+
+
+def parse_diff_file(patch_file: Path) -> Dict[str, FilePatch]:
+    """
+    Parse a patch file on disk into individual file patches.
+
+    The file is memory-mapped rather than read into memory, so very large
+    monolithic patches are scanned straight from the page cache.
+
+    Returns:
+        Dict mapping file path to FilePatch objects
+    """
+    with open(patch_file, "rb") as f:
+        # mmap cannot map an empty file
+        if os.fstat(f.fileno()).st_size == 0:
+            return {}
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_diff_output(mm)
+
+
+def ensure_parent_dir(path: Path, created_dirs: Optional[Set[Path]] = None):
+    """
+    Create the parent directory of path.
+
+    When writing many patches, pass the same created_dirs set to every
+    call so each directory is only created once.
+    """
+    parent = path.parent
+    if created_dirs is not None and parent in created_dirs:
+        return
+
+    parent.mkdir(parents=True, exist_ok=True)
+
+    if created_dirs is not None:
+        created_dirs.add(parent)
+
+
+def write_patch_file(
+    ctx: BuildContext,
+    file_path: str,
+    patch_content: Union[str, bytes],
+    created_dirs: Optional[Set[Path]] = None,
+) -> bool:
     """
     Write a patch file to chromium_src directory structure.
 
@@ -316,6 +529,7 @@ def write_patch_file(ctx: BuildContext, file_path: str, patch_content: str) -> b
         ctx: Build context
         file_path: Path of the file being patched
         patch_content: The patch content to write
+        created_dirs: Directories already created in this run (optional)
 
     Returns:
         True if successful, False otherwise
@@ -324,14 +538,18 @@ def write_patch_file(ctx: BuildContext, file_path: str, patch_content: str) -> b
     output_path = ctx.get_patch_path_for_file(file_path)
 
     # Create directory structure
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(output_path, created_dirs)
 
     try:
+        if isinstance(patch_content, str):
+            patch_content = patch_content.encode("utf-8")
+
         # Ensure patch ends with newline
-        if patch_content and not patch_content.endswith("\n"):
-            patch_content += "\n"
+        if patch_content and not patch_content.endswith(b"\n"):
+            patch_content += b"\n"
 
-        output_path.write_text(patch_content, encoding="utf-8")
+        # Binary mode so line endings are written as-is on every platform
+        output_path.write_bytes(patch_content)
         log_success(f"  Written: {output_path.relative_to(ctx.root_dir)}")
         return True
     except Exception as e:
@@ -339,13 +557,16 @@ def write_patch_file(ctx: BuildContext, file_path: str, patch_content: str) -> b
         return False
 
 
-def create_deletion_marker(ctx: BuildContext, file_path: str) -> bool:
+def create_deletion_marker(
+    ctx: BuildContext, file_path: str, created_dirs: Optional[Set[Path]] = None
+) -> bool:
     """
     Create a marker file for deleted files.
 
     Args:
         ctx: Build context
         file_path: Path of the deleted file
+        created_dirs: Directories already created in this run (optional)
 
     Returns:
         True if successful, False otherwise
@@ -353,7 +574,7 @@ def create_deletion_marker(ctx: BuildContext, file_path: str) -> bool:
     marker_path = ctx.get_dev_patches_dir() / file_path
     marker_path = marker_path.with_suffix(marker_path.suffix + ".deleted")
 
-    marker_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(marker_path, created_dirs)
 
     try:
         marker_content = f"File deleted in patch\nOriginal path: {file_path}\n"
@@ -366,7 +587,10 @@ def create_deletion_marker(ctx: BuildContext, file_path: str) -> bool:
 
 
 def create_binary_marker(
-    ctx: BuildContext, file_path: str, operation: FileOperation
+    ctx: BuildContext,
+    file_path: str,
+    operation: FileOperation,
+    created_dirs: Optional[Set[Path]] = None,
 ) -> bool:
     """
     Create a marker file for binary files.
@@ -375,6 +599,7 @@ def create_binary_marker(
         ctx: Build context
         file_path: Path of the binary file
         operation: The operation type
+        created_dirs: Directories already created in this run (optional)
 
     Returns:
         True if successful, False otherwise
@@ -382,7 +607,7 @@ def create_binary_marker(
     marker_path = ctx.get_dev_patches_dir() / file_path
     marker_path = marker_path.with_suffix(marker_path.suffix + ".binary")
 
-    marker_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_parent_dir(marker_path, created_dirs)
 
     try:
         marker_content = (